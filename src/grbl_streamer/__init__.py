@@ -25,12 +25,19 @@ import re
 import threading
 import atexit
 
-from queue import Queue
+from collections import deque
 
 from .interface import Interface
 from .callbackloghandler import CallbackLogHandler
+from .preprocessor import Preprocessor
 
-from gcode_machine import GcodeMachine
+
+# patterns for parsing Grbl's responses, compiled once at import time
+_re_parser_state_line = re.compile(r'^\[G[0123] .*')
+_re_bracket_line = re.compile(r'^\[...:.*')
+_re_setting_line = re.compile(r'\$(.*)=(.*) \((.*)\)')
+_re_gps_line = re.compile(r'\[G(\d) G(\d\d) G(\d\d) G(\d\d) G(\d\d) G(\d\d) M(\d) M(\d) M(\d) T(\d) F([\d.-]*?) S([\d.-]*?)\]')
+_re_state_v09 = re.compile(r'<(.*?),MPos:(.*?),WPos:(.*?)>')
 
 
 class GrblStreamer:
@@ -282,7 +289,7 @@ class GrblStreamer:
         # keeps track of, and can dynamically change, feed rates, as well
         # as substitute variables. It has its own state and callback
         # functions.
-        self.preprocessor = GcodeMachine()
+        self.preprocessor = Preprocessor()
         self.preprocessor.callback = self._preprocessor_callback
 
         # @var travel_dist_buffer
@@ -297,6 +304,13 @@ class GrblStreamer:
         # If the machine is currently not moving
         self.is_standstill = False
 
+        # @var batch_writes
+        # When `True` (the default), all lines that fit into Grbl's
+        # receive buffer are coalesced into a single serial write
+        # during non-incremental streaming. Set to `False` to write
+        # line by line, e.g. for debugging the serial traffic.
+        self.batch_writes = True
+
         self._ifacepath = None
         self._last_setting_number = 132
 
@@ -307,10 +321,14 @@ class GrblStreamer:
         self._standstill_watchdog_increment = 0
 
         self._rx_buffer_size = 128
-        self._rx_buffer_fill = []
-        self._rx_buffer_backlog = []
-        self._rx_buffer_backlog_line_number = []
+        # per-line byte counts currently in Grbl's receive buffer,
+        # plus a running total so no O(n) sum is needed per line
+        self._rx_buffer_fill = deque()
+        self._rx_buffer_fill_total = 0
+        self._rx_buffer_backlog = deque()
+        self._rx_buffer_backlog_line_number = deque()
         self._rx_buffer_fill_percent = 0
+        self._last_rx_percent_time = 0
 
         self._current_line = ''
         self._current_line_sent = True
@@ -326,19 +344,28 @@ class GrblStreamer:
         self.buffer = []
         self.buffer_size = 0
         self._current_line_nr = 0
+        self._last_progress_percent = -1
 
         self.buffer_stash = []
         self.buffer_size_stash = 0
         self._current_line_nr_stash = 0
 
         self._poll_keep_alive = False
+        self._poll_wake = threading.Event()
         self._iface_read_do = False
 
         self._thread_polling = None
         self._thread_read_iface = None
 
         self._iface = None
-        self._queue = Queue()
+
+        # Received lines travel from the Interface thread to the
+        # reading thread through a deque (whose append/popleft are
+        # atomic in CPython) plus an Event for wakeup. This avoids the
+        # lock and condition-variable overhead of queue.Queue for this
+        # single-producer single-consumer traffic.
+        self._queue = deque()
+        self._queue_event = threading.Event()
 
         self._loghandler = None
 
@@ -377,9 +404,9 @@ class GrblStreamer:
         if handler is not None:
             self._loghandler = handler
         else:
-            lh = CallbackLogHandler()
-            lh.callback = self._callback
-            self._loghandler = lh
+            # passing the callback here lets the handler install its
+            # per-record fast path at construction time
+            self._loghandler = CallbackLogHandler(self._callback)
 
         self.logger.addHandler(self._loghandler)
 
@@ -401,7 +428,7 @@ class GrblStreamer:
         if self._iface is None:
             self.logger.debug('{}: Setting up interface on {}'.format(self.name, self._ifacepath))
             self._iface = Interface('iface_' + self.name, self._ifacepath, baudrate)
-            self._iface.start(self._queue)
+            self._iface.start(self._queue, self._queue_event)
         else:
             self.logger.info('{}: Cannot start another interface. There is already an interface {}.'.format(self.name, self._iface))
 
@@ -430,8 +457,8 @@ class GrblStreamer:
 
         self.logger.debug('{}: Please wait until reading thread has joined...'.format(self.name))
         self._iface_read_do = False
-        # The thread will not join without putting a last queue message:
-        self._queue.put("dummy_msg_for_joining_thread")
+        # The thread will not join without a last wakeup:
+        self._queue_event.set()
         self._thread_read_iface.join()
         self.logger.debug('{}: Reading thread successfully joined.'.format(self.name))
 
@@ -494,6 +521,7 @@ class GrblStreamer:
         if not self.is_connected():
             return
         self._poll_keep_alive = True
+        self._poll_wake.clear()
         self._last_cmode = None
         if self._thread_polling is None:
             self._thread_polling = threading.Thread(target=self._poll_state)
@@ -512,6 +540,9 @@ class GrblStreamer:
 
         if self._thread_polling is not None:
             self._poll_keep_alive = False
+            # interrupt the wait so the thread joins without having to
+            # sit out the rest of the current poll interval
+            self._poll_wake.set()
             self.logger.debug('{}: Please wait until polling thread has joined...'.format(self.name))
             self._thread_polling.join()
             self.logger.debug('{}: Polling thread has successfully  joined...'.format(self.name))
@@ -590,7 +621,7 @@ class GrblStreamer:
         A string of a single G-Code command to be sent. Doesn't have to
         be \n terminated.
         """
-        bytes_in_firmware_buffer = sum(self._rx_buffer_fill)
+        bytes_in_firmware_buffer = self._rx_buffer_fill_total
         if bytes_in_firmware_buffer > 0:
             self.logger.error('Firmware buffer has {:d} unprocessed bytes in it. Will not send {}'.format(bytes_in_firmware_buffer, line))
             return
@@ -608,6 +639,9 @@ class GrblStreamer:
             # Regular querying of the hash state needs to be done like this,
             # otherwise the PRB response would be interpreted as a probe answer
             self.hash_state_requested = True
+            # the request is serviced by the polling thread, so leave
+            # the idle back-off immediately
+            self._poll_wake.set()
             return
 
         self.preprocessor.set_line(line)
@@ -618,6 +652,9 @@ class GrblStreamer:
 
         self._iface_write(self.preprocessor.line + '\n')
 
+        # leave the idle polling back-off immediately
+        self._poll_wake.set()
+
     def write(self, lines):
         """
         G-Code command strings passed to this function will be appended
@@ -642,7 +679,9 @@ class GrblStreamer:
         A string giving the relative or absolute file path
         """
         with open(filename) as f:
-            self._load_lines_into_buffer(f.read())
+            # split here once; also handles \r\n files and does not
+            # produce a spurious empty line for a trailing newline
+            self._load_lines_into_buffer(f.read().splitlines())
 
     def job_run(self, linenr=None):
         """
@@ -662,12 +701,15 @@ class GrblStreamer:
             self.current_line_number = linenr
 
         self.travel_dist_current = {}
+        self._last_progress_percent = -1
 
         self._set_streaming_src_end_reached(False)
         self._set_streaming_complete(False)
         self._streaming_enabled = True
         self._current_line_sent = True
         self._set_job_finished(False)
+        # leave the idle polling back-off immediately
+        self._poll_wake.set()
         self._stream()
 
     def job_halt(self):
@@ -683,7 +725,7 @@ class GrblStreamer:
         contents. This function will empty the buffer, set the buffer
         position to 0, and reset internal state.
         """
-        del self.buffer[:]
+        self.buffer = []
         self.buffer_size = 0
         self._current_line_nr = 0
         self._callback('on_line_number_change', 0)
@@ -724,7 +766,9 @@ class GrblStreamer:
         stream changed $ settings to Grbl, and then resume the job
         where you left off. See also `self.buffer_unstash()`.
         """
-        self.buffer_stash = list(self.buffer)
+        # hand the list over instead of copying it; job_new() below
+        # rebinds self.buffer to a fresh list
+        self.buffer_stash = self.buffer
         self.buffer_size_stash = self.buffer_size
         self._current_line_nr_stash = self._current_line_nr
         self.job_new()
@@ -771,57 +815,71 @@ class GrblStreamer:
                 self._fill_rx_buffer_until_full()
 
         elif self.target == 'simulator':
+            # tight loop over the buffer; no serial I/O to pace us here
             buf = []
-            while not self._streaming_src_end_reached:
+            while self._current_line_nr < self.buffer_size:
                 self._set_next_line(True)
-                if self._current_line_nr < self.buffer_size:
-                    buf.append(self._current_line)
+                buf.append(self._current_line)
+            self._set_streaming_src_end_reached(True)
 
-            # one line still to go
-            self._set_next_line(True)
-            buf.append(self._current_line)
+            # the loop above stops short of the terminal progress report
+            if self._last_progress_percent != 100:
+                self._callback('on_progress_percent', 100)
+                self._last_progress_percent = 100
 
             self._set_job_finished(True)
             self._callback('on_simulation_finished', buf)
 
     def _fill_rx_buffer_until_full(self):
+        # All lines that fit into Grbl's receive buffer are collected
+        # and handed to the serial interface as a single write, instead
+        # of one write syscall per line.
+        staged = [] if self.batch_writes else None
         while True:
             if self._current_line_sent:
                 self._set_next_line()
 
             if not self._streaming_src_end_reached and self._rx_buf_can_receive_current_line():
-                self._send_current_line()
+                self._send_current_line(staged)
             else:
                 break
 
+        if staged:
+            self._iface_write(''.join(staged))
+
     def _set_next_line(self, send_comments=False):
-        progress_percent = int(100 * self._current_line_nr / self.buffer_size)
-        self._callback('on_progress_percent', progress_percent)
+        progress_percent = self._current_line_nr * 100 // self.buffer_size
+        if progress_percent != self._last_progress_percent:
+            # only report changes, analogous to _last_cmode in polling
+            self._callback('on_progress_percent', progress_percent)
+            self._last_progress_percent = progress_percent
 
         if self._current_line_nr < self.buffer_size:
             # still something in _buffer, pop it
-            line = self.buffer[self._current_line_nr].strip()
-            self.preprocessor.set_line(line)
-            self.preprocessor.substitute_vars()
-            self.preprocessor.parse_state()
-            self.preprocessor.override_feed()
-            self.preprocessor.scale_spindle()
+            preprocessor = self.preprocessor
+            # buffer lines are stripped at load time already
+            line = self.buffer[self._current_line_nr]
+            preprocessor.set_line(line)
+            preprocessor.substitute_vars()
+            preprocessor.parse_state()
+            preprocessor.override_feed()
+            preprocessor.scale_spindle()
 
             if send_comments:
-                self._current_line = self.preprocessor.line + self.preprocessor.comment
+                self._current_line = preprocessor.line + preprocessor.comment
             else:
-                self._current_line = self.preprocessor.line
+                self._current_line = preprocessor.line
 
             self._current_line_sent = False
             self._current_line_nr += 1
 
-            self.preprocessor.done()
+            preprocessor.done()
 
         else:
             # the buffer is empty, nothing more to read
             self._set_streaming_src_end_reached(True)
 
-    def _send_current_line(self):
+    def _send_current_line(self, staged=None):
         if self._error:
             self.logger.error('Firmware reported error. Halting.')
             self._set_streaming_src_end_reached(True)
@@ -833,24 +891,29 @@ class GrblStreamer:
         # +1 for \n which we will append below
         line_length = len(self._current_line) + 1
         self._rx_buffer_fill.append(line_length)
+        self._rx_buffer_fill_total += line_length
         self._rx_buffer_backlog.append(self._current_line)
         self._rx_buffer_backlog_line_number.append(self._current_line_nr)
-        self._iface_write(self._current_line + '\n')
+        if staged is None:
+            self._iface_write(self._current_line + '\n')
+        else:
+            # caller batches all staged lines into a single write
+            staged.append(self._current_line + '\n')
 
         self._current_line_sent = True
         self._callback('on_line_sent', self._current_line_nr,
                        self._current_line)
 
     def _rx_buf_can_receive_current_line(self):
-        rx_free_bytes = self._rx_buffer_size - sum(self._rx_buffer_fill)
+        rx_free_bytes = self._rx_buffer_size - self._rx_buffer_fill_total
         required_bytes = len(self._current_line) + 1  # +1 because \n
         return rx_free_bytes >= required_bytes
 
     def _rx_buffer_fill_pop(self):
         if len(self._rx_buffer_fill) > 0:
-            self._rx_buffer_fill.pop(0)
-            processed_command = self._rx_buffer_backlog.pop(0)
-            ln = self._rx_buffer_backlog_line_number.pop(0) - 1
+            self._rx_buffer_fill_total -= self._rx_buffer_fill.popleft()
+            processed_command = self._rx_buffer_backlog.popleft()
+            ln = self._rx_buffer_backlog_line_number.popleft() - 1
             self._callback('on_processed_command', ln, processed_command)
 
         if self._streaming_src_end_reached and len(self._rx_buffer_fill) == 0:
@@ -864,78 +927,94 @@ class GrblStreamer:
 
     def _onread(self):
         while self._iface_read_do:
-            line = self._queue.get()
-
-            if len(line) > 0:
-                if line[0] == '<':
-                    self._update_state(line)
-
-                elif line == 'ok':
-                    self._handle_ok()
-
-                elif re.match(r'^\[G[0123] .*', line):
-                    self._update_gcode_parser_state(line)
-                    self._callback("on_read", line)
-
-                elif line.startswith('[MSG:'):
-                    # nothing to do here
-                    pass
-
-                elif re.match(r'^\[...:.*', line):
-                    self._callback('on_read', line)
-                    self._update_hash_state(line)
-
-                    if 'PRB' in line:
-                        # last line
-                        self._callback('on_hash_stateupdate', self.settings_hash)
-                        self.preprocessor.cs_offsets = self.settings_hash
-                        self._callback('on_probe', self.settings_hash['PRB'])
-
-                elif 'ALARM' in line:
-                    # grbl for some reason doesn't respond to ? polling
-                    # when there is an alarm due to soft limits
-                    self.cmode = 'Alarm'
-                    self._callback('on_stateupdate', self.cmode, self.cmpos, self.cwpos)
-                    self._callback('on_read', line)
-                    self._callback('on_alarm', line)
-
-                elif 'error' in line:
-                    # self.logger.debug("ERROR")
-                    self._error = True
-                    # self.logger.debug("%s: _rx_buffer_backlog at time of error: %s", self.name,  self._rx_buffer_backlog)
-                    if len(self._rx_buffer_backlog) > 0:
-                        problem_command = self._rx_buffer_backlog[0]
-                        problem_line = self._rx_buffer_backlog_line_number[0]
-                    else:
-                        problem_command = 'unknown'
-                        problem_line = -1
-                    self._callback('on_error', line, problem_command, problem_line)
-                    self._set_streaming_complete(True)
-                    self._set_streaming_src_end_reached(True)
-
-                elif "Grbl " in line:
-                    self._callback('on_read', line)
-                    self._on_bootup()
-                    self.hash_state_requested = True
-                    self.request_settings()
-                    self.gcode_parser_state_requested = True
+            # clear before draining, so a wakeup arriving while we
+            # drain is never lost
+            self._queue_event.wait()
+            self._queue_event.clear()
+
+            while self._iface_read_do and len(self._queue) > 0:
+                line = self._queue.popleft()
+                if len(line) > 0:
+                    self._handle_line(line)
+
+    def _handle_line(self, line):
+        # The category of a line is determined by its first characters.
+        # The dominant traffic ('ok' acknowledgements and '<...>'
+        # status reports) is dispatched with plain string comparisons;
+        # the regexes only run inside the branch they belong to.
+        if line == 'ok':
+            self._handle_ok()
+
+        elif line[0] == '<':
+            self._update_state(line)
+
+        elif line[0] == '[':
+            if _re_parser_state_line.match(line):
+                self._update_gcode_parser_state(line)
+                self._callback("on_read", line)
+
+            elif line.startswith('[MSG:'):
+                # nothing to do here
+                pass
+
+            elif _re_bracket_line.match(line):
+                self._callback('on_read', line)
+                self._update_hash_state(line)
+
+                if 'PRB' in line:
+                    # last line
+                    self._callback('on_hash_stateupdate', self.settings_hash)
+                    self.preprocessor.cs_offsets = self.settings_hash
+                    self._callback('on_probe', self.settings_hash['PRB'])
 
-                else:
-                    m = re.match(r'\$(.*)=(.*) \((.*)\)', line)
-                    if m:
-                        key = int(m.group(1))
-                        val = m.group(2)
-                        comment = m.group(3)
-                        self.settings[key] = {
-                            'val': val,
-                            'cmt': comment
-                        }
-                        self._callback('on_read', line)
-                        if key == self._last_setting_number:
-                            self._callback('on_settings_downloaded', self.settings)
-                    else:
-                        self._callback('on_read', line)
-                        # self.logger.info("{}: Could not parse settings: {}".format(self.name, line))
+            else:
+                self._callback('on_read', line)
+
+        elif 'ALARM' in line:
+            # grbl for some reason doesn't respond to ? polling
+            # when there is an alarm due to soft limits
+            self.cmode = 'Alarm'
+            self._callback('on_stateupdate', self.cmode, self.cmpos, self.cwpos)
+            self._callback('on_read', line)
+            self._callback('on_alarm', line)
+
+        elif 'error' in line:
+            # self.logger.debug("ERROR")
+            self._error = True
+            # self.logger.debug("%s: _rx_buffer_backlog at time of error: %s", self.name,  self._rx_buffer_backlog)
+            if len(self._rx_buffer_backlog) > 0:
+                problem_command = self._rx_buffer_backlog[0]
+                problem_line = self._rx_buffer_backlog_line_number[0]
+            else:
+                problem_command = 'unknown'
+                problem_line = -1
+            self._callback('on_error', line, problem_command, problem_line)
+            self._set_streaming_complete(True)
+            self._set_streaming_src_end_reached(True)
+
+        elif "Grbl " in line:
+            self._callback('on_read', line)
+            self._on_bootup()
+            self.hash_state_requested = True
+            self.request_settings()
+            self.gcode_parser_state_requested = True
+
+        else:
+            m = _re_setting_line.match(line)
+            if m:
+                key = int(m.group(1))
+                val = m.group(2)
+                comment = m.group(3)
+                self.settings[key] = {
+                    'val': val,
+                    'cmt': comment
+                }
+                self._callback('on_read', line)
+                if key == self._last_setting_number:
+                    self._callback('on_settings_downloaded', self.settings)
+            else:
+                self._callback('on_read', line)
+                # self.logger.info("{}: Could not parse settings: {}".format(self.name, line))
 
     def _handle_ok(self):
         if not self.streaming_complete:
@@ -944,8 +1023,21 @@ class GrblStreamer:
                 self._wait_empty_buffer = False
                 self._stream()
 
-        self._rx_buffer_fill_percent = int(100 - 100 * (self._rx_buffer_size - sum(self._rx_buffer_fill)) / self._rx_buffer_size)
-        self._callback('on_rx_buffer_percent', self._rx_buffer_fill_percent)
+        percent = self._rx_buffer_fill_total * 100 // self._rx_buffer_size
+
+        # report only changes, rate-limited to 20 Hz; faster reports
+        # are of no use to a UI. An empty buffer is always reported so
+        # the final state is never missed. The comparison must be
+        # against the last REPORTED percent: a change suppressed by the
+        # rate window would otherwise never be delivered once the value
+        # stops moving.
+        now = time.monotonic()
+        if (self._rx_buffer_fill_total == 0
+                or (percent != self._rx_buffer_fill_percent
+                    and now - self._last_rx_percent_time > 0.05)):
+            self._callback('on_rx_buffer_percent', percent)
+            self._last_rx_percent_time = now
+            self._rx_buffer_fill_percent = percent
 
     def _on_bootup(self):
         self._onboot_init()
@@ -954,15 +1046,15 @@ class GrblStreamer:
         self._callback('on_boot')
 
     def _update_hash_state(self, line):
-        line = line.replace(']', '').replace('[', '')
-        parts = line.split(':')
-        key = parts[0]
-        tpl_str = parts[1].split(',')
-        tpl = tuple([float(x) for x in tpl_str])
-        self.settings_hash[key] = tpl
+        # e.g. [G54:0.000,0.000,0.000] or [PRB:0.000,0.000,0.000:1];
+        # slicing off the brackets replaces the two replace() passes,
+        # split(':') also discards the PRB success flag after the
+        # second colon, and map dispatches the float parsing in C
+        parts = line[1:-1].split(':')
+        self.settings_hash[parts[0]] = tuple(map(float, parts[1].split(',')))
 
     def _update_gcode_parser_state(self, line):
-        m = re.match(r'\[G(\d) G(\d\d) G(\d\d) G(\d\d) G(\d\d) G(\d\d) M(\d) M(\d) M(\d) T(\d) F([\d.-]*?) S([\d.-]*?)\]', line)
+        m = _re_gps_line.match(line)
         if m:
             self.gps[0] = m.group(1)  # motionmode
             self.gps[1] = m.group(2)  # current coordinate system
@@ -983,34 +1075,40 @@ class GrblStreamer:
             self.logger.error('{}: Could not parse gcode parser report: "{}"'.format(self.name, line))
 
     def _update_state(self, line):
-        m = re.match(r'<(.*?),MPos:(.*?),WPos:(.*?)>', line)
-        if m is not None:
+        if '|' in line:
+            # GRBL v1.1 reports are strictly pipe-delimited:
+            # <Idle|MPos:0.0000,0.0000,0.0000|Bf:15,128|FS:0.0,0|WCO:0.0000,0.0000,0.0000>
+            # Tokenizing with str.split is cheaper than the regex
+            # attempts previously made per poll.
+            body = line[1:-1] if line.endswith('>') else line[1:]
+            parts = body.split('|')
+            mpos = None  # machine position reported (when $10=1)
+            wpos = None  # work position reported (when $10=0)
+            for part in parts[1:]:
+                key, _, val = part.partition(':')
+                if key == 'MPos':
+                    mpos = tuple(map(float, val.split(',')))
+                elif key == 'WPos':
+                    wpos = tuple(map(float, val.split(',')))
+            if mpos is None and wpos is None:
+                self.logger.error('{}: Could not parse MPos or WPos: "{}"'.format(self.name, line))
+                return
+            self.cmode = parts[0]
+            if mpos is not None:
+                self.cmpos = mpos
+            if wpos is not None:
+                self.cwpos = wpos
+        else:
             # GRBL v0.9
             # <Idle,MPos:0.000,3.000,0.000,WPos:0.000,3.000,0.000>
-            self.cmode = m.group(1)
-            mpos_parts = m.group(2).split(',')
-            wpos_parts = m.group(3).split(',')
-            self.cmpos = (float(mpos_parts[0]), float(mpos_parts[1]), float(mpos_parts[2]))
-            self.cwpos = (float(wpos_parts[0]), float(wpos_parts[1]), float(wpos_parts[2]))
-        else:
-            # GRBL v1.1
-            # <Idle|MPos:0.0000,0.0000,0.0000|Bf:15,128|FS:0.0,0|WCO:0.0000,0.0000,0.0000>
-            m = re.match(r'<(.*?)\|MPos:(.*?)\|', line)
+            m = _re_state_v09.match(line)
             if m is not None:
-                # machine position reported (when $10=1)
                 self.cmode = m.group(1)
-                mpos_parts = m.group(2).split(',')
-                self.cmpos = (float(mpos_parts[0]), float(mpos_parts[1]), float(mpos_parts[2]))
+                self.cmpos = tuple(map(float, m.group(2).split(',')))
+                self.cwpos = tuple(map(float, m.group(3).split(',')))
             else:
-                m = re.match(r'<(.*?)\|WPos:(.*?)\|', line)
-                if m is not None:
-                    # work position reported (when $10=0)
-                    self.cmode = m.group(1)
-                    wpos_parts = m.group(2).split(',')
-                    self.cwpos = (float(wpos_parts[0]), float(wpos_parts[1]), float(wpos_parts[2]))
-                else:
-                    self.logger.error('{}: Could not parse MPos or WPos: "{}"'.format(self.name, line))
-                    return
+                self.logger.error('{}: Could not parse MPos or WPos: "{}"'.format(self.name, line))
+                return
         # if we made it here, we parsed MPos or WPos or both
 
         if (
@@ -1046,29 +1144,34 @@ class GrblStreamer:
         self._last_cwpos = self.cwpos
 
     def _load_line_into_buffer(self, line):
-        self.preprocessor.set_line(line)
-        split_lines = self.preprocessor.split_lines()
+        preprocessor = self.preprocessor
+        preprocessor.set_line(line)
+        split_lines = preprocessor.split_lines()
 
+        buffer_append = self.buffer.append
         for l1 in split_lines:
-            self.preprocessor.set_line(l1)
-            self.preprocessor.strip()
-            self.preprocessor.tidy()
-            self.preprocessor.parse_state()
-            self.preprocessor.find_vars()
-            fractionized_lines = self.preprocessor.fractionize()
+            preprocessor.set_line(l1)
+            preprocessor.strip()
+            preprocessor.tidy()
+            preprocessor.parse_state()
+            preprocessor.find_vars()
+            fractionized_lines = preprocessor.fractionize()
 
             for l2 in fractionized_lines:
-                self.buffer.append(l2)
+                # store canonical lines so the send path does not have
+                # to strip every line again while streaming
+                buffer_append(l2.strip())
                 self.buffer_size += 1
 
-            self.preprocessor.done()
+            preprocessor.done()
 
     def _load_lines_into_buffer(self, lines):
         if type(lines) is str:
             lines = lines.split('\n')
 
+        load_line = self._load_line_into_buffer
         for line in lines:
-            self._load_line_into_buffer(line)
+            load_line(line)
 
         self._callback('on_bufsize_change', self.buffer_size)
         self._callback('on_vars_change', self.preprocessor.vars)
@@ -1081,9 +1184,10 @@ class GrblStreamer:
 
     def _onboot_init(self):
         # called after boot. Mimics Grbl's initial state after boot.
-        del self._rx_buffer_fill[:]
-        del self._rx_buffer_backlog[:]
-        del self._rx_buffer_backlog_line_number[:]
+        self._rx_buffer_fill.clear()
+        self._rx_buffer_fill_total = 0
+        self._rx_buffer_backlog.clear()
+        self._rx_buffer_backlog_line_number.clear()
         self._set_streaming_complete(True)
         self._set_job_finished(True)
         self._set_streaming_src_end_reached(True)
@@ -1093,14 +1197,15 @@ class GrblStreamer:
         self._clear_queue()
         self.is_standstill = False
         self.preprocessor.reset()
+        self._last_progress_percent = 0
         self._callback('on_progress_percent', 0)
         self._callback('on_rx_buffer_percent', 0)
 
     def _clear_queue(self):
         try:
-            junk = self._queue.get_nowait()
+            junk = self._queue.popleft()
             self.logger.debug('Discarding junk %s', junk)
-        except:
+        except IndexError:
             # self.logger.debug("Queue was empty")
             pass
 
@@ -1108,6 +1213,10 @@ class GrblStreamer:
         while self._poll_keep_alive:
             self._counter += 1
 
+            # deadline-based timing keeps the poll rate steady
+            # regardless of how long the requests below take
+            deadline = time.monotonic() + self.poll_interval
+
             if self.hash_state_requested:
                 self.get_hash_state()
                 self.hash_state_requested = False
@@ -1119,7 +1228,15 @@ class GrblStreamer:
             else:
                 self._get_state()
 
-            time.sleep(self.poll_interval)
+            # When the machine sits in Idle at a standstill, state
+            # updates carry no information. Back off to reduce the
+            # serial chatter; job_run() and send_immediately() set
+            # the wake event to return to the normal rate instantly.
+            if self.cmode == 'Idle' and self.is_standstill:
+                deadline += self.poll_interval * 4
+
+            if self._poll_wake.wait(max(0.0, deadline - time.monotonic())):
+                self._poll_wake.clear()
 
         self.logger.debug('{}: Polling has been stopped'.format(self.name))
 
@@ -21,9 +21,18 @@ along with pyglpainter. If not, see <https://www.gnu.org/licenses/>.
 import logging
 
 class CallbackLogHandler(logging.StreamHandler):
-    def __init__(self, cb=None):
+    def __init__(self, cb=None, level=logging.NOTSET):
         super(CallbackLogHandler, self).__init__()
+        # records below this level are discarded by the logging
+        # machinery before emit() is ever called
+        self.setLevel(level)
         self.callback = cb
+        if cb is not None:
+            # Shadow the emit method with a closure. The logging
+            # machinery then calls the callback directly per record,
+            # without the attribute load and branch of the fallback
+            # method below.
+            self.emit = lambda record, _cb=cb: _cb('on_log', record)
 
     def emit(self, record):
         if self.callback:
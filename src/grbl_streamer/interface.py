@@ -48,19 +48,27 @@ class Interface:
         self.path = path
         self.baud = baud
         self.queue = None
+        self.event = None
         self.logger = logging.getLogger('GrblStreamer.interface')
 
-        self._buf_receive = ''
+        self._buf_receive = bytearray()
         self._do_receive = False
 
-    def start(self, queue):
+    def start(self, queue, event=None):
         """
         Open the device node and start a Thread for reading.
 
         @param queue
-        An instance of Python3's `Queue()` class.
+        An instance of Python3's `collections.deque` class. Received
+        lines will be appended to it.
+
+        @param event
+        An instance of Python3's `threading.Event` class. It will be
+        set after lines have been appended to the queue, to wake up
+        the consumer.
         """
         self.queue = queue
+        self.event = event
 
         self.logger.info(
                 '%s: connecting to %s with baudrate %i',
@@ -110,24 +118,37 @@ class Interface:
 
     def _receiving(self):
         while self._do_receive:
-            data = self.serialport.read(1)
-            waiting = self.serialport.inWaiting()
-            data += self.serialport.read(waiting)
+            waiting = self.serialport.in_waiting
+            if waiting > 0:
+                # drain everything queued with a single read
+                data = self.serialport.read(waiting)
+            else:
+                # blocks for at most the port timeout (1 s) until the
+                # first byte arrives, then picks up the rest of the
+                # burst
+                data = self.serialport.read(1)
+                data += self.serialport.read(self.serialport.in_waiting)
             self._handle_data(data)
 
     def _handle_data(self, data):
-        try:
-            asci = data.decode('ascii')
-        except UnicodeDecodeError:
-            self.logger.info(
-                '%s: Received a non-ascii byte. Probably junk. Dropping it.',
-                self.name)
-            asci = ""
-
-        for i in range(0, len(asci)):
-            char = asci[i]
-            self._buf_receive += char
-            # not all received lines are complete (end with \n)
-            if char == "\n":
-                self.queue.put(self._buf_receive.strip())
-                self._buf_receive = ""
+        # in-place extension of a bytearray, amortized O(1) per byte
+        self._buf_receive += data
+
+        # not all received lines are complete (end with \n)
+        if b'\n' not in data:
+            return
+
+        *complete, self._buf_receive = self._buf_receive.split(b'\n')
+
+        for raw in complete:
+            try:
+                line = raw.decode('ascii')
+            except UnicodeDecodeError:
+                self.logger.info(
+                    '%s: Received a non-ascii line. Probably junk. Dropping it.',
+                    self.name)
+                continue
+            self.queue.append(line.strip())
+
+        if self.event is not None and len(complete) > 0:
+            self.event.set()
@@ -0,0 +1,272 @@
+"""
+grbl-streamer - Universal interface module for the grbl CNC firmware
+Copyright (C) 2015 Michael Franzl
+
+This file is part of grbl-streamer.
+
+grbl-streamer is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+grbl-streamer is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with pyglpainter. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import re
+
+from gcode_machine import GcodeMachine
+
+# deletion table for strip(): spaces and line/tab whitespace
+_strip_table = str.maketrans('', '', ' \t\r\n')
+
+
+def _strip_feed(line):
+    """
+    Remove every F word (an 'F' followed by at least one digit or dot)
+    from `line`. Equivalent to substituting the pattern F[.\\d]+ with
+    the empty string, without entering the regex engine.
+    """
+    i = line.find('F')
+    if i == -1:
+        return line
+    n = len(line)
+    parts = []
+    start = 0
+    while i != -1:
+        j = i + 1
+        while j < n and (line[j].isdigit() or line[j] == '.'):
+            j += 1
+        if j > i + 1:
+            parts.append(line[start:i])
+            start = j
+        i = line.find('F', j)
+    parts.append(line[start:])
+    return ''.join(parts)
+
+
+class Preprocessor(GcodeMachine):
+    """A GcodeMachine specialized for streaming.
+
+    Every line that goes out to Grbl passes through the preprocessor
+    several times, so the per-line methods of GcodeMachine are the
+    hottest code in this module. This subclass overrides some of them
+    with behaviorally equivalent but faster implementations.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # The base class pattern '#(\d*)' also matches a bare '#' with
+        # an empty variable index, registering a phantom variable ''
+        # and making substitute_vars() blank the entire line. Require
+        # at least one digit. find_vars() and substitute_vars() pick
+        # this pattern up through the instance attribute.
+        self._re_use_var = re.compile(r'#(\d+)')
+
+        # cache of the last formatted F word, valid as long as
+        # `request_feed` does not change
+        self._feed_str = None
+        self._feed_str_for = None
+
+        # memoization of `tidy()` results, keyed on the raw line.
+        # CAM-generated G-Code repeats many lines verbatim, so the
+        # hit rate is high. Bounded to keep memory flat on huge jobs.
+        self._tidy_cache = {}
+        self._tidy_cache_max = 4096
+
+        # frozenset view of `whitelist_commands` for O(1) membership
+        # tests, rebuilt by `cache_clear()`
+        self._whitelist_sets = {
+            cmd: frozenset(numbers)
+            for cmd, numbers in self.whitelist_commands.items()
+        }
+
+    def cache_clear(self):
+        """
+        Drop all memoized `tidy()` results. Call this after changing
+        `whitelist_commands`, otherwise stale results may be returned.
+        """
+        self._tidy_cache.clear()
+        self._whitelist_sets = {
+            cmd: frozenset(numbers)
+            for cmd, numbers in self.whitelist_commands.items()
+        }
+
+    def strip(self):
+        """
+        Remove all whitespace from the line.
+
+        One `str.translate` pass against a deletion table instead of
+        the base class's `replace` plus `strip` (two passes, two
+        intermediate strings). Interior tabs are removed as well, which
+        the base class left in place; Grbl ignores whitespace, so this
+        makes no difference on the wire.
+        """
+        self.line = self.line.translate(_strip_table)
+
+    def tidy(self):
+        """
+        Strips G-Code not contained in the whitelist.
+
+        Same behavior as the base class, but the regex transformation
+        is memoized per raw line, exploiting the heavy line repetition
+        in typical CAM-generated G-Code.
+
+        One deviation from the base class: `line_is_unsupported_cmd` is
+        recomputed for every line. The base class never resets it, so
+        after one unsupported command every following line without a
+        G/M/T word (e.g. `X1 Y1` continuation moves) would silently be
+        commented out as well.
+        """
+        line = self.line
+
+        # Most streamed lines are continuation moves like 'X1.5 Y0.2'.
+        # Without a G, M or T character the command regex cannot match
+        # and the line would come back unchanged, so skip all the work.
+        if 'G' not in line and 'M' not in line and 'T' not in line:
+            self.line_is_unsupported_cmd = False
+            return
+
+        cached = self._tidy_cache.get(line)
+
+        if cached is None:
+            if len(self._tidy_cache) >= self._tidy_cache_max:
+                self._tidy_cache.clear()
+
+            unsupported = False
+            whitelist = self._whitelist_sets
+
+            # transform [MGT]\d to G\d\d for better parsing
+            def format_cmd_number(matchobj):
+                nonlocal unsupported
+                cmd = matchobj.group(1)
+                cmd_nr = int(matchobj.group(2))
+                if not (cmd in whitelist and cmd_nr in whitelist[cmd]):
+                    unsupported = True
+                return '{}{:02d}'.format(cmd, cmd_nr)
+
+            tidied = self._re_match_cmd_number.sub(format_cmd_number, line)
+            cached = (tidied, unsupported)
+            self._tidy_cache[line] = cached
+
+        tidied, unsupported = cached
+        self.line_is_unsupported_cmd = unsupported
+
+        if unsupported:
+            self.line = ';' + tidied + \
+                    ' ;' + self.special_comment_prefix + \
+                    '.unsupported'
+        else:
+            self.line = tidied
+
+    def tidy_many(self, lines):
+        """
+        Tidy an iterable of lines in one call and return a list.
+
+        Equivalent to calling `tidy()` once per element, but the loop
+        runs with the fast-path character test and the result list
+        bound to locals, so per-line method dispatch is paid only for
+        lines that actually contain a command. `line` and
+        `line_is_unsupported_cmd` are left at the values of the last
+        processed command line.
+        """
+        tidy = self.tidy
+        result = []
+        append = result.append
+        for line in lines:
+            if 'G' not in line and 'M' not in line and 'T' not in line:
+                append(line)
+                continue
+            self.line = line
+            tidy()
+            append(self.line)
+        return result
+
+    def find_vars(self):
+        """
+        Parse variable assignments and usages in the current line.
+
+        Variables are rare in streamed G-Code, so a plain substring
+        test skips both regex passes of the base class on lines that
+        cannot contain one.
+        """
+        if '#' not in self.line:
+            return
+        super().find_vars()
+
+    def substitute_vars(self):
+        """
+        Substitute variables with values from the `vars` dict.
+
+        Same fast path as `find_vars()`: without a '#' character there
+        is nothing to substitute.
+        """
+        if '#' not in self.line:
+            return
+        super().substitute_vars()
+
+    def override_feed(self):
+        """
+        Report feed changes and replace the F word when feed override
+        is active.
+
+        Same logic as the base class, but the rendered F word is cached
+        and reused while `request_feed` stays the same, instead of
+        being formatted again on every line.
+        """
+        contains_feed = self.contains_feed
+        do_feed_override = self.do_feed_override
+
+        if not do_feed_override and contains_feed:
+            # Notify caller of detected feed in current line (useful for UIs)
+            feed = self.feed_in_current_line
+            if self.current_feed != feed:
+                self.callback("on_feed_change", feed)
+            self.current_feed = feed
+
+        request_feed = self.request_feed
+        if do_feed_override and request_feed:
+
+            if contains_feed:
+                # strip the original F setting
+                self.logger.info("stripping feed " + self.line)
+                self.line = _strip_feed(self.line).strip()
+
+            if self.current_feed != request_feed:
+                if self._feed_str_for != request_feed:
+                    self._feed_str = "F{:0.1f}".format(request_feed)
+                    self._feed_str_for = request_feed
+                self.line += self._feed_str
+                self.current_feed = request_feed
+                self.logger.info("overriding feed " + str(request_feed))
+                self.callback("on_feed_change", request_feed)
+
+    def transform_comments(self):
+        """
+        Split the current line into command and comment.
+
+        The overwhelming majority of G-Code lines contain either no
+        comment at all or a semicolon comment. Both cases can be
+        handled with a single `str.find` instead of the three regular
+        expression passes of the base class. Lines containing
+        parentheses comments are rare and are delegated to the base
+        class.
+        """
+        line = self.line
+        if '(' in line:
+            self.comment = ''
+            super().transform_comments()
+            return
+
+        idx = line.find(';')
+        if idx == -1:
+            self.comment = ''
+        else:
+            self.line = line[:idx]
+            self.comment = line[idx:]
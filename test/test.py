@@ -5,6 +5,21 @@ import logging
 from grbl_streamer import GrblStreamer
 
 formatter = logging.Formatter()
+_format_log = formatter.format
+
+# right-aligned event names, computed once per event type
+_padded_events = {}
+
+
+def _on_stateupdate(cls, args):
+    cls.cmode = args[0]
+    cls.cmpos = args[1]
+
+
+# O(1) dispatch table for events that need handling beyond printing
+_handlers = {
+    'on_stateupdate': _on_stateupdate,
+}
 
 # Run the tests against a real grbl on /dev/ttyUSB0 with 115200 baud.
 # Both of the two main grbl variants should work:
@@ -26,12 +41,15 @@ class Test(unittest.TestCase):
 
     @classmethod
     def callback(cls, event, *args):
-        if event == 'on_stateupdate':
-            cls.cmode = args[0]
-            cls.cmpos = args[1]
+        handler = _handlers.get(event)
+        if handler is not None:
+            handler(cls, args)
 
-        data = formatter.format(args[0]) if event == 'on_log' else args
-        print('{}: {}'.format(event.rjust(30, ' '), data))
+        data = _format_log(args[0]) if event == 'on_log' else args
+        name = _padded_events.get(event)
+        if name is None:
+            name = _padded_events.setdefault(event, event.rjust(30, ' '))
+        print('{}: {}'.format(name, data))
 
 
     @classmethod